@@ -1,187 +1,327 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-from tkcalendar import DateEntry
-from PIL import Image, ImageTk
 from datetime import datetime
+import io
+import math
 import os
+import sys
 import sqlite3
+import atexit
+from contextlib import contextmanager
+from functools import lru_cache
+from operator import itemgetter
 import csv
-import matplotlib
-# Set the backend before importing pyplot to prevent GUI conflicts
-matplotlib.use('TkAgg')
-import matplotlib.pyplot as plt
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
-import getpass
+from email.message import EmailMessage
+# matplotlib, numpy, Pillow, tkcalendar and getpass are imported where they are used,
+# so starting the CLI doesn't pay for modules a session may never need
 
 # ==============================================================================
 # SECTION 1: CORE EXPENSE TRACKER LOGIC
 # ==============================================================================
 
-def connect_db():
-    """Establishes a connection to the SQLite database."""
-    if not os.path.exists('data'):
-        os.makedirs('data')
-    conn = sqlite3.connect('data/expenses.db')
-    return conn
+_conn = None
+_db_lock = threading.Lock()
+_settings_cache = {}
+
+_plot_lock = threading.Lock()
+_plot_figure = None
+
+# Number of expense rows the GUI loads at a time as the list is scrolled
+EXPENSE_PAGE_SIZE = 200
+
+# Charts show at most this many bars; smaller categories are grouped as "Other"
+MAX_PLOT_CATEGORIES = 12
+
+# Queries run on every GUI refresh. Keeping each as a single string lets the
+# helpers and refresh_state() share one entry in the connection's statement cache.
+_MONTH_GOAL_QUERY = "SELECT goal FROM goals WHERE month = ?"
+_MONTH_TOTAL_QUERY = "SELECT COALESCE(SUM(amount), 0) / 100.0 FROM expenses WHERE date >= ? AND date < ?"
+_BREAKDOWN_QUERY = "SELECT category, SUM(amount) / 100.0 AS total FROM expenses GROUP BY category ORDER BY total DESC"
+
+def _get_conn():
+    """Returns the shared SQLite connection, opening it on first use.
+
+    Callers must hold _db_lock while using the connection, since it is shared
+    with the GUI worker threads.
+    """
+    global _conn
+    if _conn is None:
+        if not os.path.exists('data'):
+            os.makedirs('data')
+        _conn = sqlite3.connect('data/expenses.db', check_same_thread=False, isolation_level=None,
+                                cached_statements=256)
+        # WAL with synchronous=NORMAL turns each commit into a single append instead of two fsyncs.
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute("PRAGMA synchronous=NORMAL")
+        _conn.execute("PRAGMA mmap_size=268435456")
+        _conn.execute("PRAGMA temp_store=MEMORY")
+        _conn.execute("PRAGMA cache_size=-20000")
+        atexit.register(_conn.close)
+    return _conn
+
+@contextmanager
+def _transaction():
+    """Runs the enclosed writes in a single transaction on the shared connection."""
+    with _db_lock:
+        conn = _get_conn()
+        conn.execute("BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+# Amounts are stored as integer cents; queries divide by 100.0 so callers still get floats
+_EXPENSES_TABLE = '''
+    CREATE TABLE IF NOT EXISTS {} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date TEXT NOT NULL,
+        amount INTEGER NOT NULL,
+        category TEXT NOT NULL,
+        note TEXT
+    )
+'''
+
+def _migrate_amounts_to_cents(conn):
+    """Rebuilds an expenses table created with REAL amounts so it stores integer cents."""
+    column_types = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(expenses)")}
+    if column_types.get('amount', '').upper() != 'REAL':
+        return
+    sequence = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'expenses'").fetchone()
+    conn.execute(_EXPENSES_TABLE.format('expenses_new'))
+    conn.execute('''
+        INSERT INTO expenses_new (id, date, amount, category, note)
+        SELECT id, date, CAST(ROUND(amount * 100) AS INTEGER), category, note FROM expenses
+    ''')
+    conn.execute("DROP TABLE expenses")
+    conn.execute("ALTER TABLE expenses_new RENAME TO expenses")
+    if sequence:
+        # Keep AUTOINCREMENT from reusing the IDs of previously deleted expenses
+        conn.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = 'expenses'", sequence)
 
 def initialize_db():
     """Initializes the database with the necessary tables if they don't exist."""
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS expenses (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            date TEXT NOT NULL,
-            amount REAL NOT NULL,
-            category TEXT NOT NULL,
-            note TEXT
-        )
-    ''')
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS categories (
-            name TEXT PRIMARY KEY
-        )
-    ''')
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS goals (
-            month TEXT PRIMARY KEY,
-            goal REAL NOT NULL
-        )
-    ''')
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS settings (
-            key TEXT PRIMARY KEY,
-            value TEXT
-        )
-    ''')
-    # Set default currency if not present
-    cursor.execute("INSERT OR IGNORE INTO settings (key, value) VALUES ('currency_symbol', '$')")
-    
-    cursor.execute("SELECT COUNT(*) FROM categories")
-    if cursor.fetchone()[0] == 0:
-        default_categories = ['Food', 'Travel', 'Shopping', 'Bills', 'Misc']
-        cursor.executemany("INSERT INTO categories (name) VALUES (?)", [(cat,) for cat in default_categories])
-    conn.commit()
-    conn.close()
+    with _transaction() as conn:
+        conn.execute(_EXPENSES_TABLE.format('expenses'))
+        _migrate_amounts_to_cents(conn)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS categories (
+                name TEXT PRIMARY KEY
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS goals (
+                month TEXT PRIMARY KEY,
+                goal REAL NOT NULL
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses(date)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_expenses_cat ON expenses(category)")
+        # Set default currency if not present
+        conn.execute("INSERT OR IGNORE INTO settings (key, value) VALUES ('currency_symbol', '$')")
+
+        if conn.execute("SELECT COUNT(*) FROM categories").fetchone()[0] == 0:
+            default_categories = ['Food', 'Travel', 'Shopping', 'Bills', 'Misc']
+            conn.executemany("INSERT INTO categories (name) VALUES (?)", [(cat,) for cat in default_categories])
+
+def _month_bounds(month_str):
+    """Returns the first day of a month (YYYY-MM) and of the month after it.
+
+    Filtering with date >= start AND date < end lets SQLite use idx_expenses_date,
+    whereas strftime('%Y-%m', date) forces a full table scan.
+    """
+    year, month = map(int, month_str.split('-'))
+    next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return f"{year:04d}-{month:02d}-01", f"{next_year:04d}-{next_month:02d}-01"
 
 def get_setting(key):
-    """Retrieves a setting value from the database."""
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute("SELECT value FROM settings WHERE key = ?", (key,))
-    result = cursor.fetchone()
-    conn.close()
-    return result[0] if result else None
+    """Retrieves a setting value, reading the database only on the first lookup."""
+    with _db_lock:
+        if key not in _settings_cache:
+            result = _get_conn().execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+            _settings_cache[key] = result[0] if result else None
+        return _settings_cache[key]
 
 def update_setting(key, value):
-    """Updates a setting in the database."""
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute("REPLACE INTO settings (key, value) VALUES (?, ?)", (key, value))
-    conn.commit()
-    conn.close()
+    """Updates a setting in the database and in the in-memory cache."""
+    with _transaction() as conn:
+        conn.execute("REPLACE INTO settings (key, value) VALUES (?, ?)", (key, value))
+        _settings_cache.pop(key, None)
+    # Write through once committed, so the next lookup doesn't go back to SQLite
+    with _db_lock:
+        _settings_cache[key] = value
+
+# Cents are stored in an SQLite INTEGER, which is a signed 64-bit value
+_MAX_CENTS = 2**63 - 1
+
+def _validate_expense(date_str, amount, category, note):
+    """Returns the expense as a row ready to insert, raising ValueError if it is invalid."""
+    # Store zero-padded dates so the range filters on date compare correctly
+    date_str = datetime.strptime(date_str, '%Y-%m-%d').strftime('%Y-%m-%d')
+    amount = float(amount)
+    if not math.isfinite(amount):
+        raise ValueError("Amount must be a finite number.")
+    cents = int(round(amount * 100))
+    if cents <= 0:
+        raise ValueError("Amount must be a positive number.")
+    if cents > _MAX_CENTS:
+        raise ValueError("Amount is too large.")
+    return date_str, cents, category, note
 
 def add_expense(date_str, amount, category, note):
     """Adds a new expense to the database."""
+    return add_expenses_bulk([(date_str, amount, category, note)])
+
+def add_expenses_bulk(rows):
+    """Adds (date, amount, category, note) rows in a single transaction.
+
+    Every row is validated before anything is written, so either the whole
+    batch is stored or none of it is.
+    """
     try:
-        datetime.strptime(date_str, '%Y-%m-%d')
-        if float(amount) <= 0:
-            raise ValueError("Amount must be a positive number.")
+        rows = [_validate_expense(*row) for row in rows]
     except ValueError as e:
         print(f"Error: Invalid input. {e}")
         return False
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO expenses (date, amount, category, note) VALUES (?, ?, ?, ?)",
-                   (date_str, amount, category, note))
-    conn.commit()
-    conn.close()
+    with _transaction() as conn:
+        conn.executemany("INSERT INTO expenses (date, amount, category, note) VALUES (?, ?, ?, ?)", rows)
     return True
 
-def get_all_expenses():
-    """Retrieves all expenses from the database, ordered by date."""
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, date, amount, category, note FROM expenses ORDER BY date DESC")
-    expenses = cursor.fetchall()
-    conn.close()
-    return expenses
+def _select_expenses(conn, limit=None, after=None):
+    """Runs the newest-first expense query on conn; the caller must hold _db_lock."""
+    sql = "SELECT id, date, amount / 100.0, category, note FROM expenses"
+    params = []
+    if after is not None:
+        # Keyset pagination: continue strictly after the last (date, id) already loaded
+        sql += " WHERE (date, id) < (?, ?)"
+        params.extend(after)
+    sql += " ORDER BY date DESC, id DESC"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return conn.execute(sql, params).fetchall()
+
+def get_all_expenses(limit=None, after=None):
+    """Retrieves expenses from the database, newest first.
+
+    Pass limit to fetch a single page, and the (date, id) of the last row
+    already loaded as after to fetch the page that follows it.
+    """
+    with _db_lock:
+        return _select_expenses(_get_conn(), limit, after)
+
+def iter_all_expenses(chunk_size=256):
+    """Yields every expense, newest first, without loading them all into memory.
+
+    Rows are fetched chunk_size at a time so _db_lock is only held while
+    reading from SQLite, never while the caller handles a row.
+    """
+    with _db_lock:
+        cursor = _get_conn().execute("SELECT id, date, amount / 100.0, category, note FROM expenses ORDER BY date DESC, id DESC")
+    while True:
+        with _db_lock:
+            rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield from rows
 
 def delete_expense(expense_id):
     """Deletes an expense from the database by its ID."""
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM expenses WHERE id = ?", (expense_id,))
-    conn.commit()
-    success = cursor.rowcount > 0
-    conn.close()
-    return success
+    with _transaction() as conn:
+        cursor = conn.execute("DELETE FROM expenses WHERE id = ?", (expense_id,))
+    return cursor.rowcount > 0
 
 def get_categories():
     """Retrieves all expense categories from the database."""
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute("SELECT name FROM categories ORDER BY name")
-    categories = [row[0] for row in cursor.fetchall()]
-    conn.close()
-    return categories
+    with _db_lock:
+        return [row[0] for row in _get_conn().execute("SELECT name FROM categories ORDER BY name")]
+
+@lru_cache(maxsize=1)
+def get_categories_cached():
+    """Returns the categories as a tuple, querying the database only until they change."""
+    return tuple(get_categories())
 
 def add_category(category_name):
     """Adds a new category to the database."""
     if not category_name.strip():
         return False, "Category name cannot be empty."
-    conn = connect_db()
-    cursor = conn.cursor()
     try:
-        cursor.execute("INSERT INTO categories (name) VALUES (?)", (category_name,))
-        conn.commit()
+        with _transaction() as conn:
+            conn.execute("INSERT INTO categories (name) VALUES (?)", (category_name,))
+        get_categories_cached.cache_clear()
         return True, f"Category '{category_name}' added successfully."
     except sqlite3.IntegrityError:
         return False, f"Error: Category '{category_name}' already exists."
-    finally:
-        conn.close()
 
 def set_monthly_goal(month_str, goal_amount):
     """Sets or updates the spending goal for a specific month (YYYY-MM)."""
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute("REPLACE INTO goals (month, goal) VALUES (?, ?)", (month_str, goal_amount))
-    conn.commit()
-    conn.close()
+    with _transaction() as conn:
+        conn.execute("REPLACE INTO goals (month, goal) VALUES (?, ?)", (month_str, goal_amount))
 
 def get_monthly_goal(month_str):
     """Retrieves the spending goal for a specific month (YYYY-MM)."""
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute("SELECT goal FROM goals WHERE month = ?", (month_str,))
-    result = cursor.fetchone()
-    conn.close()
+    with _db_lock:
+        result = _get_conn().execute(_MONTH_GOAL_QUERY, (month_str,)).fetchone()
     return result[0] if result else 0.0
 
 def get_total_expenses_for_month(month_str):
     """Calculates the total expenses for a specific month (YYYY-MM)."""
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute("SELECT SUM(amount) FROM expenses WHERE strftime('%Y-%m', date) = ?", (month_str,))
-    result = cursor.fetchone()
-    conn.close()
-    return result[0] if result[0] is not None else 0.0
-
-def send_summary_email(sender_email, password, recipient_email, plot_path):
-    """Sends a summary email with the category breakdown plot."""
+    with _db_lock:
+        return _get_conn().execute(_MONTH_TOTAL_QUERY, _month_bounds(month_str)).fetchone()[0]
+
+def get_month_overview(month_str):
+    """Returns (currency_symbol, goal, spent) for a month (YYYY-MM) from a single query."""
+    with _db_lock:
+        return _get_conn().execute('''
+            SELECT (SELECT value FROM settings WHERE key = 'currency_symbol'),
+                   COALESCE((SELECT goal FROM goals WHERE month = ?), 0.0),
+                   (SELECT COALESCE(SUM(amount), 0) / 100.0 FROM expenses WHERE date >= ? AND date < ?)
+        ''', (month_str, *_month_bounds(month_str))).fetchone()
+
+def refresh_state(month_str, limit=None):
+    """Fetches everything the GUI shows in one locked round-trip.
+
+    Returns a tuple of (expenses, goal, spent) for the given month (YYYY-MM),
+    where expenses holds at most limit of the newest rows.
+    """
+    with _db_lock:
+        conn = _get_conn()
+        expenses = _select_expenses(conn, limit)
+        goal = conn.execute(_MONTH_GOAL_QUERY, (month_str,)).fetchone()
+        spent = conn.execute(_MONTH_TOTAL_QUERY, _month_bounds(month_str)).fetchone()[0]
+    return expenses, goal[0] if goal else 0.0, spent
+
+def send_summary_email(sender_email, password, recipient_email, plot_path=None):
+    """Sends a summary email with the category breakdown plot, rendering it if no path is given."""
     currency_symbol = get_setting('currency_symbol')
     current_month_str = datetime.now().strftime('%Y-%m')
     total_expenses = get_total_expenses_for_month(current_month_str)
+    if plot_path is None:
+        # Render straight to memory rather than re-reading the shared chart file
+        png = render_breakdown_png(get_category_breakdown(), currency_symbol)
+        filename = 'category_breakdown.png'
+    else:
+        try:
+            with _plot_lock, open(plot_path, "rb") as attachment:
+                png = attachment.read()
+        except FileNotFoundError:
+            return False, "Attachment file not found."
+        filename = os.path.basename(plot_path)
 
-    if not plot_path:
+    if not png:
         return False, "Could not generate the plot for the email."
 
-    msg = MIMEMultipart()
+    msg = EmailMessage()
     msg['From'] = sender_email
     msg['To'] = recipient_email
     msg['Subject'] = f"Your Expense Summary for {current_month_str}"
@@ -196,92 +336,121 @@ def send_summary_email(sender_email, password, recipient_email, plot_path):
         <p>Regards,<br>PyTrack</p>
     </body></html>
     """
-    msg.attach(MIMEText(body, 'html'))
+    msg.set_content(body, subtype='html')
 
-    try:
-        with open(plot_path, "rb") as attachment:
-            part = MIMEBase("application", "octet-stream")
-            part.set_payload(attachment.read())
-        encoders.encode_base64(part)
-        part.add_header("Content-Disposition", f"attachment; filename= {os.path.basename(plot_path)}")
-        msg.attach(part)
-    except FileNotFoundError:
-        return False, "Attachment file not found."
+    msg.add_attachment(png, maintype='image', subtype='png', filename=filename)
 
     try:
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(sender_email, password)
-        text = msg.as_string()
-        server.sendmail(sender_email, recipient_email, text)
-        server.quit()
+        with smtplib.SMTP('smtp.gmail.com', 587) as server:
+            server.starttls()
+            server.login(sender_email, password)
+            # send_message serialises the message straight to the socket in one pass
+            server.send_message(msg)
         return True, "Email sent successfully!"
     except Exception as e:
         return False, f"Failed to send email: {e}"
         
 def get_expenses_in_date_range(start_date, end_date):
     """Retrieves expenses within a specific date range."""
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute("SELECT date, amount, category, note FROM expenses WHERE date BETWEEN ? AND ? ORDER BY date",
-                   (start_date, end_date))
-    expenses = cursor.fetchall()
-    conn.close()
-    return expenses
+    with _db_lock:
+        return _get_conn().execute("SELECT date, amount / 100.0, category, note FROM expenses WHERE date BETWEEN ? AND ? ORDER BY date",
+                                   (start_date, end_date)).fetchall()
 
 def get_category_breakdown():
     """Calculates the total expense for each category."""
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute('SELECT category, SUM(amount) FROM expenses GROUP BY category ORDER BY SUM(amount) DESC')
-    breakdown = cursor.fetchall()
-    conn.close()
-    return breakdown
+    with _db_lock:
+        return _get_conn().execute(_BREAKDOWN_QUERY).fetchall()
 
 def get_highest_expense_current_month():
     """Finds the single highest expense in the current month."""
     current_month = datetime.now().strftime('%Y-%m')
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT date, amount, category, note FROM expenses
-        WHERE strftime('%Y-%m', date) = ?
-        ORDER BY amount DESC LIMIT 1
-    ''', (current_month,))
-    expense = cursor.fetchone()
-    conn.close()
-    return expense
+    with _db_lock:
+        return _get_conn().execute('''
+            SELECT date, amount / 100.0, category, note FROM expenses
+            WHERE date >= ? AND date < ?
+            ORDER BY amount DESC LIMIT 1
+        ''', _month_bounds(current_month)).fetchone()
 
 def get_average_daily_expense():
     """Calculates the average daily expense."""
-    conn = connect_db()
-    cursor = conn.cursor()
-    cursor.execute('SELECT AVG(daily_total) FROM (SELECT SUM(amount) as daily_total FROM expenses GROUP BY date)')
-    average = cursor.fetchone()[0]
-    conn.close()
+    with _db_lock:
+        average = _get_conn().execute('SELECT AVG(daily_total) / 100.0 FROM (SELECT SUM(amount) as daily_total FROM expenses GROUP BY date)').fetchone()[0]
     return average if average else 0.0
 
-def plot_and_save_breakdown(breakdown, currency_symbol='$'):
-    """Generates and saves a bar chart from breakdown data. Must be run in the main thread."""
+def stream_expenses_csv(filepath=None):
+    """Exports all expenses to a CSV file, writing rows straight from the cursor."""
+    if filepath is None:
+        if not os.path.exists('reports'):
+            os.makedirs('reports')
+        filepath = os.path.join('reports', 'expenses.csv')
+    with open(filepath, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(['Date', 'Amount', 'Category', 'Note'])
+        # Amounts are written as raw numbers; display formatting is left to the reader
+        with _db_lock:
+            writer.writerows(_get_conn().execute("SELECT date, amount / 100.0, category, note FROM expenses ORDER BY date"))
+    print(f"Expenses exported to {filepath}")
+    return filepath
+
+def _get_plot_figure():
+    """Returns the shared (figure, axes, canvas) used for charts, creating them on first use.
+
+    Callers must hold _plot_lock while drawing on it.
+    """
+    global _plot_figure
+    if _plot_figure is None:
+        # Plots are drawn with the headless Agg canvas so worker threads can render them
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        fig = Figure(figsize=(10, 6))
+        _plot_figure = (fig, fig.add_subplot(111), FigureCanvasAgg(fig))
+    return _plot_figure
+
+def render_breakdown_png(breakdown, currency_symbol='$'):
+    """Renders a bar chart of breakdown data and returns it as PNG bytes. Safe to call from worker threads."""
     if not breakdown:
         print("No expense data to plot.")
         return None
+    import numpy as np
+    
+    categories, amounts = zip(*breakdown)
+    # An ndarray skips matplotlib's per-element unit conversion
+    amounts = np.asarray(amounts, dtype=np.float64)
+    if len(amounts) > MAX_PLOT_CATEGORIES:
+        # Keep the largest categories and fold the long tail into a single "Other" bar
+        order = np.argsort(amounts)[::-1]
+        top = order[:MAX_PLOT_CATEGORIES - 1]
+        categories = [categories[i] for i in top] + ['Other']
+        amounts = np.append(amounts[top], amounts[order[MAX_PLOT_CATEGORIES - 1:]].sum())
+    positions = np.arange(len(categories))
+    
+    png = io.BytesIO()
+    # Workers share the figure, so only one may render at a time
+    with _plot_lock:
+        fig, ax, canvas = _get_plot_figure()
+        ax.clear()
+        ax.bar(positions, amounts, color='skyblue')
+        ax.set_xticks(positions)
+        ax.set_xticklabels(categories, rotation=45, ha='right')
+        ax.set_xlabel('Category')
+        ax.set_ylabel(f'Total Amount ({currency_symbol})')
+        ax.set_title('Expense Breakdown by Category')
+        fig.tight_layout()
+        canvas.print_png(png)
+    return png.getvalue()
+
+def plot_and_save_breakdown(breakdown, currency_symbol='$'):
+    """Generates and saves a bar chart from breakdown data. Safe to call from worker threads."""
+    png = render_breakdown_png(breakdown, currency_symbol)
+    if png is None:
+        return None
     if not os.path.exists('reports'):
         os.makedirs('reports')
     filepath = os.path.join('reports', 'category_breakdown.png')
-    
-    categories = [item[0] for item in breakdown]
-    amounts = [item[1] for item in breakdown]
-    
-    plt.figure(figsize=(10, 6))
-    plt.bar(categories, amounts, color='skyblue')
-    plt.xlabel('Category')
-    plt.ylabel(f'Total Amount ({currency_symbol})')
-    plt.title('Expense Breakdown by Category')
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    plt.savefig(filepath)
-    plt.close()
+    # The chart file is shared too; holding the lock keeps writers and readers from overlapping
+    with _plot_lock:
+        with open(filepath, 'wb') as chart_file:
+            chart_file.write(png)
     print(f"Chart saved to {filepath}")
     return filepath
 
@@ -314,6 +483,13 @@ class ExpenseTrackerApp(tk.Tk):
     def __init__(self):
         super().__init__()
         self.currency_symbol = get_setting('currency_symbol')
+        self._last_loaded = None
+        self._has_more_expenses = False
+        self._page_pending = False
+        self._refresh_pending = False
+        self._plot_cache_key = None
+        self._plot_photo = None
+        self._last_goal_state = None
         self.title("PyTrack")
         self.geometry("1150x850")
         self.style = ttk.Style(self)
@@ -336,6 +512,10 @@ class ExpenseTrackerApp(tk.Tk):
         self.title_label = tk.Label(self, text="Welcome to PyTrack - Your Smart Expense Tracker", font=("Arial", 20))
         self.title_label.pack(pady=10)
 
+        # Packed before the main frame so it keeps its row when the window shrinks
+        self.status_label = ttk.Label(self, text="", anchor=tk.W, padding=(10, 2))
+        self.status_label.pack(side=tk.BOTTOM, fill=tk.X)
+
         main_frame = ttk.Frame(self, padding="10")
         main_frame.pack(fill=tk.BOTH, expand=True)
 
@@ -345,6 +525,7 @@ class ExpenseTrackerApp(tk.Tk):
         input_frame = ttk.LabelFrame(left_panel, text="Log an Expense", padding="10")
         input_frame.pack(fill=tk.X, expand=True)
         ttk.Label(input_frame, text="Date:").grid(row=0, column=0, sticky=tk.W, pady=3)
+        from tkcalendar import DateEntry
         self.date_entry = DateEntry(input_frame, width=15, date_pattern='y-mm-dd')
         self.date_entry.grid(row=0, column=1, sticky="ew", pady=3)
         ttk.Label(input_frame, text="Amount:").grid(row=1, column=0, sticky=tk.W, pady=3)
@@ -371,7 +552,6 @@ class ExpenseTrackerApp(tk.Tk):
         self.budget_status_label.pack()
         set_goal_btn = ttk.Button(goal_frame, text="Set Monthly Goal", command=self.set_goal_gui)
         set_goal_btn.pack(pady=5)
-        self.update_goal_display()
 
         report_frame = ttk.LabelFrame(left_panel, text="Reports & Actions", padding="10")
         report_frame.pack(fill=tk.X, expand=True)
@@ -391,9 +571,10 @@ class ExpenseTrackerApp(tk.Tk):
         for col in cols: self.tree.heading(col, text=col)
         self.tree.column("ID", width=40, anchor=tk.CENTER)
         self.tree.column("Amount", width=100, anchor=tk.E)
-        scrollbar = ttk.Scrollbar(display_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.update_amount_header()
+        self.scrollbar = ttk.Scrollbar(display_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscroll=self.on_tree_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.tree.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
         delete_btn = ttk.Button(display_frame, text="Delete Selected Expense", command=self.start_delete_expense_thread)
         delete_btn.pack()
@@ -401,21 +582,62 @@ class ExpenseTrackerApp(tk.Tk):
         self.load_expenses()
 
     def load_categories(self):
-        self.category_combobox['values'] = get_categories()
+        self.category_combobox['values'] = get_categories_cached()
         if self.category_combobox['values']: self.category_combobox.current(0)
 
     def load_expenses(self):
+        expenses, goal, spent = refresh_state(datetime.now().strftime('%Y-%m'), EXPENSE_PAGE_SIZE)
+        self.tree.delete(*self.tree.get_children())
+        self.append_expenses(expenses)
+        self.update_goal_display(goal, spent)
+
+    def schedule_refresh(self):
+        """Queues a single load_expenses() for when Tk is idle, merging bursts of changes."""
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.after_idle(self._do_refresh)
+
+    def _do_refresh(self):
+        self._refresh_pending = False
+        self.load_expenses()
+
+    def append_expenses(self, expenses):
+        """Appends a page of expenses to the tree and records where the next page starts."""
+        # Bind the insert method and the amount formatter once instead of per row
+        insert = self.tree.insert
+        fmt = (self.currency_symbol.replace('{', '{{').replace('}', '}}') + "{:,.2f}").format
+        for exp in expenses:
+            insert("", "end", values=(exp[0], exp[1], fmt(exp[2]), exp[3], exp[4]))
+        if expenses:
+            self._last_loaded = (expenses[-1][1], expenses[-1][0])
+        self._has_more_expenses = len(expenses) == EXPENSE_PAGE_SIZE
+        self._page_pending = False
+
+    def on_tree_scroll(self, first, last):
+        """Keeps the scrollbar in sync and loads the next page near the bottom."""
+        self.scrollbar.set(first, last)
+        if self._has_more_expenses and not self._page_pending and float(last) > 0.95:
+            self._page_pending = True
+            self.after_idle(self.load_more_expenses)
+
+    def load_more_expenses(self):
+        self.append_expenses(get_all_expenses(EXPENSE_PAGE_SIZE, self._last_loaded))
+
+    def update_amount_header(self):
         self.tree.heading('Amount', text=f'Amount ({self.currency_symbol})')
-        for item in self.tree.get_children(): self.tree.delete(item)
-        for exp in get_all_expenses():
-            formatted_amount = f"{self.currency_symbol}{exp[2]:,.2f}"
-            self.tree.insert("", "end", values=(exp[0], exp[1], formatted_amount, exp[3], exp[4]))
-        self.update_goal_display()
 
-    def update_goal_display(self):
+    def update_goal_display(self, goal=None, spent=None):
+        """Refreshes the goal widgets, querying only the values not passed in."""
         month_str = datetime.now().strftime('%Y-%m')
-        goal = get_monthly_goal(month_str)
-        spent = get_total_expenses_for_month(month_str)
+        if goal is None:
+            goal = get_monthly_goal(month_str)
+        if spent is None:
+            spent = get_total_expenses_for_month(month_str)
+        # Restyling the widgets is not free, so skip it when nothing shown would change
+        state = (goal, spent, self.currency_symbol)
+        if state == self._last_goal_state:
+            return
+        self._last_goal_state = state
         
         self.goal_label.config(text=f"Goal: {self.currency_symbol}{goal:,.2f} | Spent: {self.currency_symbol}{spent:,.2f}")
         
@@ -442,15 +664,17 @@ class ExpenseTrackerApp(tk.Tk):
                                          initialvalue=current_goal, minvalue=0)
         if new_goal is not None:
             set_monthly_goal(month_str, new_goal)
-            self.update_goal_display()
+            self.update_goal_display(goal=new_goal)
             
     def change_currency_gui(self):
         new_symbol = simpledialog.askstring("Change Currency", "Enter the new currency symbol:",
                                             initialvalue=self.currency_symbol)
         if new_symbol:
             self.currency_symbol = new_symbol
+            self._plot_cache_key = None
             update_setting('currency_symbol', new_symbol)
-            self.load_expenses() # This will refresh all displays
+            self.update_amount_header()
+            self.schedule_refresh() # This will refresh all displays
 
     def start_add_expense_thread(self):
         date, amount_str, category, note = self.date_entry.get(), self.amount_entry.get(), self.category_combobox.get(), self.note_entry.get()
@@ -473,9 +697,10 @@ class ExpenseTrackerApp(tk.Tk):
 
     def finish_add_expense(self, success):
         if success:
+            self._plot_cache_key = None
             messagebox.showinfo("Success", "Expense added successfully.")
             self.clear_entries()
-            self.load_expenses()
+            self.schedule_refresh()
         else:
             messagebox.showerror("Error", "Failed to add expense.")
             
@@ -495,8 +720,9 @@ class ExpenseTrackerApp(tk.Tk):
 
     def finish_delete_expense(self, success):
         if success:
+            self._plot_cache_key = None
             messagebox.showinfo("Success", "Expense deleted.")
-            self.load_expenses()
+            self.schedule_refresh()
         else:
             messagebox.showerror("Error", "Failed to delete expense.")
 
@@ -507,6 +733,10 @@ class ExpenseTrackerApp(tk.Tk):
             (messagebox.showinfo if success else messagebox.showerror)("Status", message)
             if success: self.load_categories()
 
+    def set_status(self, text):
+        """Shows progress for background work without blocking the event loop."""
+        self.status_label.config(text=text)
+
     def clear_entries(self):
         self.amount_entry.delete(0, tk.END)
         self.note_entry.delete(0, tk.END)
@@ -520,41 +750,52 @@ class ExpenseTrackerApp(tk.Tk):
             if not all((sender, password, recipient)):
                 messagebox.showerror("Error", "All fields are required.")
                 return
-            # Generate the plot in the main thread
-            currency_symbol = get_setting('currency_symbol')
-            breakdown_data = get_category_breakdown()
-            plot_path = plot_and_save_breakdown(breakdown_data, currency_symbol)
-            if not plot_path:
-                messagebox.showerror("Error", "Could not generate the plot for the email.")
-                return
-            messagebox.showinfo("Sending", "Sending email in the background...")
-            threading.Thread(target=self.worker_send_email, args=(sender, password, recipient, plot_path), daemon=True).start()
+            self.set_status("Sending email in the background...")
+            threading.Thread(target=self.worker_send_email, args=(sender, password, recipient), daemon=True).start()
 
-    def worker_send_email(self, sender, password, recipient, plot_path):
-        success, message = send_summary_email(sender, password, recipient, plot_path)
-        self.after(0, lambda: messagebox.showinfo("Email Status", message))
+    def worker_send_email(self, sender, password, recipient):
+        # The plot is rendered here too, keeping the main thread free
+        try:
+            success, message = send_summary_email(sender, password, recipient)
+        except Exception as e:
+            message = f"Failed to send email: {e}"
+        self.after(0, self.set_status, message)
 
     def start_plot_thread(self):
-        messagebox.showinfo("Generating Plot", "Fetching data...")
+        self.set_status("Generating plot...")
         threading.Thread(target=self.worker_fetch_breakdown_data, daemon=True).start()
         
     def worker_fetch_breakdown_data(self):
-        breakdown_data = get_category_breakdown()
-        self.after(0, self.finish_plot_generation, breakdown_data)
+        try:
+            breakdown_data = get_category_breakdown()
+            plot_key = hash((tuple(breakdown_data), self.currency_symbol))
+            if plot_key == self._plot_cache_key:
+                # Nothing changed since the last render, so reuse the cached image
+                self.after(0, self.show_plot_window)
+                return
+            png = render_breakdown_png(breakdown_data, self.currency_symbol)
+        except Exception as e:
+            self.after(0, self.set_status, f"Failed to generate plot: {e}")
+            return
+        self.after(0, self.finish_plot_generation, png, plot_key)
 
-    def finish_plot_generation(self, breakdown_data):
-        if not breakdown_data:
+    def finish_plot_generation(self, png, plot_key):
+        if not png:
+            self.set_status("")
             messagebox.showinfo("Info", "No data to generate a plot.")
             return
-        filepath = plot_and_save_breakdown(breakdown_data, self.currency_symbol)
-        if filepath and os.path.exists(filepath):
-            plot_window = tk.Toplevel(self)
-            plot_window.title("Category Expense Breakdown")
-            img = Image.open(filepath)
-            photo = ImageTk.PhotoImage(img)
-            img_label = tk.Label(plot_window, image=photo)
-            img_label.image = photo
-            img_label.pack()
+        from PIL import Image, ImageTk
+        self._plot_photo = ImageTk.PhotoImage(Image.open(io.BytesIO(png)))
+        self._plot_cache_key = plot_key
+        self.show_plot_window()
+
+    def show_plot_window(self):
+        self.set_status("")
+        plot_window = tk.Toplevel(self)
+        plot_window.title("Category Expense Breakdown")
+        img_label = tk.Label(plot_window, image=self._plot_photo)
+        img_label.image = self._plot_photo
+        img_label.pack()
 
 def main_gui():
     app = ExpenseTrackerApp()
@@ -564,49 +805,67 @@ def main_gui():
 # SECTION 3: COMMAND-LINE INTERFACE
 # ==============================================================================
 
+_BAR = '=' * 40
+
 def print_header(title):
     """Prints a formatted header for the CLI."""
-    print(f"\n{'='*40}\n{title:^40}\n{'='*40}")
+    print(f"\n{_BAR}\n{title:^40}\n{_BAR}")
+
+def prompt_number(message, caster=float, predicate=lambda x: x > 0, error="Invalid value.",
+                  invalid="Please enter a number.", allow_blank=False):
+    """Prompts until the input converts with caster and satisfies predicate.
+
+    With allow_blank, an empty answer returns None instead of prompting again.
+    """
+    while True:
+        answer = input(message)
+        if allow_blank and not answer:
+            return None
+        try:
+            value = caster(answer)
+        except ValueError:
+            print(invalid)
+            continue
+        if predicate(value):
+            return value
+        print(error)
 
 def get_expense_input_cli():
     """Gets expense details from user input in the CLI."""
     date_str = input("Enter date (YYYY-MM-DD, default is today): ") or datetime.now().strftime('%Y-%m-%d')
-    while True:
-        try:
-            amount = float(input("Enter amount: "))
-            if amount > 0: break
-            print("Amount must be positive.")
-        except ValueError: print("Invalid amount. Please enter a number.")
-    categories = get_categories()
-    for i, category in enumerate(categories, 1): print(f"  {i}. {category}")
-    while True:
-        try:
-            choice = int(input(f"Enter choice (1-{len(categories)}): "))
-            if 1 <= choice <= len(categories):
-                category = categories[choice - 1]
-                break
-            print("Invalid choice.")
-        except ValueError: print("Please enter a number.")
+    amount = prompt_number("Enter amount: ", error="Amount must be positive.",
+                           invalid="Invalid amount. Please enter a number.")
+    categories = get_categories_cached()
+    sys.stdout.write("".join(f"  {i}. {category}\n" for i, category in enumerate(categories, 1)))
+    choice = prompt_number(f"Enter choice (1-{len(categories)}): ", int,
+                           lambda x: 1 <= x <= len(categories), "Invalid choice.")
+    category = categories[choice - 1]
     return date_str, amount, category, input("Enter a short note (optional): ")
 
 def view_all_expenses_cli():
-    """Displays all recorded expenses in the CLI."""
+    """Displays all recorded expenses in the CLI. Returns whether there were any."""
     currency_symbol = get_setting('currency_symbol')
     print_header("All Expenses")
-    expenses = get_all_expenses()
-    if not expenses:
+    lines = []
+    any_seen = False
+    for exp in iter_all_expenses():
+        if not any_seen:
+            print(f"{'ID':<5} {'Date':<12} {'Amount':<12} {'Category':<15} {'Note':<20}\n{'-'*70}")
+            any_seen = True
+        lines.append(f"{exp[0]:<5} {exp[1]:<12} {currency_symbol}{exp[2]:<11,.2f} {exp[3]:<15} {exp[4]:<20}\n")
+        # Flush in blocks so memory stays bounded while writes stay batched
+        if len(lines) == 256:
+            sys.stdout.write("".join(lines))
+            lines.clear()
+    sys.stdout.write("".join(lines))
+    if not any_seen:
         print("No expenses logged yet.")
-        return
-    print(f"{'ID':<5} {'Date':<12} {'Amount':<12} {'Category':<15} {'Note':<20}\n{'-'*70}")
-    for exp in expenses: 
-        print(f"{exp[0]:<5} {exp[1]:<12} {currency_symbol}{exp[2]:<11,.2f} {exp[3]:<15} {exp[4]:<20}")
+    return any_seen
 
 def delete_expense_cli():
     """Handles deleting an expense via the CLI."""
     print_header("Delete an Expense")
-    view_all_expenses_cli()
-    expenses = get_all_expenses()
-    if not expenses:
+    if not view_all_expenses_cli():
         return
     try:
         expense_id = int(input("\nEnter the ID of the expense to delete (or 0 to cancel): "))
@@ -618,79 +877,105 @@ def delete_expense_cli():
     except ValueError:
         print("Invalid ID. Please enter a number.")
 
+def _report_date_range_cli():
+    """Lists the expenses within a date range and their total."""
+    currency_symbol = get_setting('currency_symbol')
+    start = input("Enter start date (YYYY-MM-DD): ")
+    end = input("Enter end date (YYYY-MM-DD): ")
+    expenses = get_expenses_in_date_range(start, end)
+    # The rows are listed anyway, so total them here rather than scanning the range twice
+    total = sum(map(itemgetter(1), expenses))
+    print_header(f"Expenses from {start} to {end}")
+    sys.stdout.write("".join(f"- {exp[0]}: {currency_symbol}{exp[1]:.2f} ({exp[2]})\n" for exp in expenses))
+    print(f"\nTotal: {currency_symbol}{total:,.2f}")
+
+def _report_category_breakdown_cli():
+    """Prints the total spent in each category."""
+    currency_symbol = get_setting('currency_symbol')
+    print_header("Category-wise Breakdown")
+    sys.stdout.write("".join(f"- {cat}: {currency_symbol}{total:,.2f}\n" for cat, total in get_category_breakdown()))
+
+def _report_highest_expense_cli():
+    """Prints the largest expense of the current month."""
+    currency_symbol = get_setting('currency_symbol')
+    print_header("Highest Expense This Month")
+    expense = get_highest_expense_current_month()
+    if expense: print(f"Date: {expense[0]}, Amount: {currency_symbol}{expense[1]:,.2f}, Category: {expense[2]}, Note: {expense[3]}")
+    else: print("No expenses recorded this month.")
+
+def _report_average_daily_cli():
+    """Prints the average amount spent per day with expenses."""
+    currency_symbol = get_setting('currency_symbol')
+    print_header("Average Daily Expense")
+    print(f"Your average daily expense is {currency_symbol}{get_average_daily_expense():,.2f}")
+
+def _report_plot_cli():
+    """Saves the category breakdown chart."""
+    plot_and_save_breakdown(get_category_breakdown(), get_setting('currency_symbol'))
+
+# Menu choices map to their handlers; None marks the choice that leaves the menu
+_REPORT_ACTIONS = {
+    '1': _report_date_range_cli,
+    '2': _report_category_breakdown_cli,
+    '3': _report_highest_expense_cli,
+    '4': _report_average_daily_cli,
+    '5': _report_plot_cli,
+    '6': stream_expenses_csv,
+    '7': None,
+}
+
+def _invalid_choice():
+    print("Invalid choice.")
+
 def view_reports_cli():
     """Shows the reporting submenu for the CLI."""
-    currency_symbol = get_setting('currency_symbol')
     while True:
         print_header("Reports Menu")
-        print("1. Total expenses for a date range\n2. Category-wise expense breakdown\n3. Highest expense of current month\n4. Average daily expense\n5. Generate category plot\n6. Back to main menu")
-        choice = input("Enter your choice: ")
-        if choice == '1':
-            start = input("Enter start date (YYYY-MM-DD): ")
-            end = input("Enter end date (YYYY-MM-DD): ")
-            expenses = get_expenses_in_date_range(start, end)
-            total = sum(exp[1] for exp in expenses)
-            print_header(f"Expenses from {start} to {end}")
-            for exp in expenses: print(f"- {exp[0]}: {currency_symbol}{exp[1]:.2f} ({exp[2]})")
-            print(f"\nTotal: {currency_symbol}{total:,.2f}")
-        elif choice == '2':
-            print_header("Category-wise Breakdown")
-            for cat, total in get_category_breakdown(): print(f"- {cat}: {currency_symbol}{total:,.2f}")
-        elif choice == '3':
-            print_header("Highest Expense This Month")
-            expense = get_highest_expense_current_month()
-            if expense: print(f"Date: {expense[0]}, Amount: {currency_symbol}{expense[1]:,.2f}, Category: {expense[2]}, Note: {expense[3]}")
-            else: print("No expenses recorded this month.")
-        elif choice == '4':
-            print_header("Average Daily Expense")
-            print(f"Your average daily expense is {currency_symbol}{get_average_daily_expense():,.2f}")
-        elif choice == '5':
-            data = get_category_breakdown()
-            plot_and_save_breakdown(data, currency_symbol)
-        elif choice == '6': break
-        else: print("Invalid choice.")
+        print("1. Total expenses for a date range\n2. Category-wise expense breakdown\n3. Highest expense of current month\n4. Average daily expense\n5. Generate category plot\n6. Export expenses to CSV\n7. Back to main menu")
+        handler = _REPORT_ACTIONS.get(input("Enter your choice: "), _invalid_choice)
+        if handler is None: break
+        handler()
+
+def _add_category_cli():
+    """Prompts for a new category name and saves it."""
+    new_cat = input("Enter new category name: ").strip().title()
+    if new_cat:
+        success, message = add_category(new_cat)
+        print(message)
+    else: print("Category name cannot be empty.")
+
+_CATEGORY_ACTIONS = {'1': _add_category_cli, '2': None}
 
 def manage_categories_cli():
     """Shows the category management submenu for the CLI."""
     while True:
         print_header("Manage Categories")
-        print("Existing Categories:", ", ".join(get_categories()))
+        print("Existing Categories:", ", ".join(get_categories_cached()))
         print("\n1. Add a new category\n2. Back to main menu")
-        choice = input("Enter your choice: ")
-        if choice == '1':
-            new_cat = input("Enter new category name: ").strip().title()
-            if new_cat:
-                success, message = add_category(new_cat)
-                print(message)
-            else: print("Category name cannot be empty.")
-        elif choice == '2': break
-        else: print("Invalid choice.")
+        handler = _CATEGORY_ACTIONS.get(input("Enter your choice: "), _invalid_choice)
+        if handler is None: break
+        handler()
 
 def manage_goal_cli():
     """Handles setting and viewing the monthly goal via the CLI."""
-    currency_symbol = get_setting('currency_symbol')
     print_header("Monthly Goal")
     month_str = datetime.now().strftime('%Y-%m')
-    goal = get_monthly_goal(month_str)
-    spent = get_total_expenses_for_month(month_str)
-    print(f"Current month: {month_str}")
-    print(f"Your goal is set to: {currency_symbol}{goal:,.2f}")
-    print(f"You have spent: {currency_symbol}{spent:,.2f}")
+    currency_symbol, goal, spent = get_month_overview(month_str)
+    lines = [f"Current month: {month_str}",
+             f"Your goal is set to: {currency_symbol}{goal:,.2f}",
+             f"You have spent: {currency_symbol}{spent:,.2f}"]
     if goal > 0:
         remaining = goal - spent
-        print(f"Remaining budget: {currency_symbol}{remaining:,.2f}" if remaining >= 0 else f"You are {currency_symbol}{-remaining:,.2f} over budget.")
+        label = "Remaining budget" if remaining >= 0 else "Over budget by"
+        lines.append(f"{label}: {currency_symbol}{abs(remaining):,.2f}")
+    print("\n".join(lines))
     
-    try:
-        new_goal_str = input("\nEnter a new goal amount (or leave blank to keep current): ")
-        if new_goal_str:
-            new_goal = float(new_goal_str)
-            if new_goal >= 0:
-                set_monthly_goal(month_str, new_goal)
-                print(f"Goal for {month_str} updated to {currency_symbol}{new_goal:,.2f}")
-            else:
-                print("Goal must be a positive number.")
-    except ValueError:
-        print("Invalid amount. Please enter a number.")
+    new_goal = prompt_number("\nEnter a new goal amount (or leave blank to keep current): ",
+                             predicate=lambda x: x >= 0, error="Goal must be a positive number.",
+                             invalid="Invalid amount. Please enter a number.", allow_blank=True)
+    if new_goal is not None:
+        set_monthly_goal(month_str, new_goal)
+        print(f"Goal for {month_str} updated to {currency_symbol}{new_goal:,.2f}")
         
 def manage_currency_cli():
     """Handles changing the currency via the CLI."""
@@ -702,10 +987,23 @@ def manage_currency_cli():
         update_setting('currency_symbol', new_symbol)
         print(f"Currency symbol updated to: {new_symbol}")
 
+# Emails are sent in the background so the menu returns while SMTP is busy
+_email_executor = ThreadPoolExecutor(max_workers=2)
+atexit.register(_email_executor.shutdown, wait=True)
+
+def _report_email_result(future):
+    """Prints the outcome of a background email once it completes."""
+    try:
+        success, message = future.result()
+    except Exception as e:
+        message = f"Failed to send email: {e}"
+    print(f"\n[Email] {message}")
+
 def send_email_cli():
     """Handles sending an email summary via the CLI."""
     print_header("Send Email Summary")
     sender_email = input("Enter your sender email address: ")
+    import getpass
     password = getpass.getpass("Enter your email app password: ")
     recipient_email = input("Enter the recipient's email address: ")
 
@@ -713,9 +1011,25 @@ def send_email_cli():
         print("\nAll fields are required. Aborting.")
         return
 
-    print("\nSending email...")
-    success, message = send_summary_email(sender_email, password, recipient_email)
-    print(message)
+    future = _email_executor.submit(send_summary_email, sender_email, password, recipient_email)
+    future.add_done_callback(_report_email_result)
+    print("\nEmail queued; you will be notified when it has been sent.")
+
+def _add_expense_cli():
+    """Collects an expense from the user and saves it."""
+    if add_expense(*get_expense_input_cli()): print("\nExpense added successfully!")
+
+_MAIN_ACTIONS = {
+    '1': _add_expense_cli,
+    '2': view_all_expenses_cli,
+    '3': view_reports_cli,
+    '4': manage_categories_cli,
+    '5': delete_expense_cli,
+    '6': manage_goal_cli,
+    '7': manage_currency_cli,
+    '8': send_email_cli,
+    '9': None,
+}
 
 def main_cli():
     """Displays the main menu for the CLI and handles user interaction."""
@@ -723,18 +1037,11 @@ def main_cli():
     while True:
         print_header("PyTrack: Main Menu")
         print("1. Add expense\n2. View all expenses\n3. View reports\n4. Manage categories\n5. Delete expense\n6. Manage monthly goal\n7. Change Currency\n8. Send Email Summary\n9. Exit")
-        choice = input("Enter your choice: ")
-        if choice == '1':
-            if add_expense(*get_expense_input_cli()): print("\nExpense added successfully!")
-        elif choice == '2': view_all_expenses_cli()
-        elif choice == '3': view_reports_cli()
-        elif choice == '4': manage_categories_cli()
-        elif choice == '5': delete_expense_cli()
-        elif choice == '6': manage_goal_cli()
-        elif choice == '7': manage_currency_cli()
-        elif choice == '8': send_email_cli()
-        elif choice == '9': print("Exiting PyTrack...\nGoodbye!"); break
-        else: print("Invalid choice.")
+        handler = _MAIN_ACTIONS.get(input("Enter your choice: "), _invalid_choice)
+        if handler is None:
+            print("Exiting PyTrack...\nGoodbye!")
+            break
+        handler()
 
 # ==============================================================================
 # SECTION 4: MAIN LAUNCHER